@@ -1,13 +1,31 @@
 """CLI interface for cpitd using Click."""
 
 import sys
+from typing import Callable
 
 import click
 
 from cpitd import __version__
-from cpitd.config import ConfigFileError, build_config, load_file_config
-from cpitd.pipeline import scan_and_report
-from cpitd.tokenizer import NormalizationLevel
+
+# cpitd.config and cpitd.pipeline pull in pygments; they are imported inside
+# main() so that ``cpitd --help`` and ``cpitd --version`` start instantly.
+
+
+def _to_normalization_level(value: object) -> object:
+    """Convert the ``--normalize`` integer to a NormalizationLevel."""
+    from cpitd.tokenizer import NormalizationLevel
+
+    return NormalizationLevel(value)
+
+
+# CLI parameter name -> (Config field name, value converter).  Parameters
+# not listed here map to the Config field of the same name, unconverted.
+_PARAM_DISPATCH: dict[str, tuple[str, Callable[[object], object]]] = {
+    "normalize": ("normalize", _to_normalization_level),
+    "ignore": ("ignore_patterns", tuple),
+    "suppress": ("suppress_patterns", tuple),
+    "languages": ("languages", tuple),
+}
 
 
 def _expand_cli_param(name: str, value: object) -> tuple[str, object]:
@@ -19,25 +37,21 @@ def _expand_cli_param(name: str, value: object) -> tuple[str, object]:
     Returns:
         A (config_field_name, converted_value) pair.
     """
-    if name == "normalize":
-        return name, NormalizationLevel(value)
-    if name in ("ignore", "suppress", "languages"):
-        config_key = {"ignore": "ignore_patterns", "suppress": "suppress_patterns"}.get(
-            name, name
-        )
-        return config_key, tuple(value)
-    return name, value
+    entry = _PARAM_DISPATCH.get(name)
+    if entry is None:
+        return name, value
+    config_key, convert = entry
+    return config_key, convert(value)
 
 
 def _collect_explicit_args(ctx: click.Context, **kwargs: object) -> dict[str, object]:
     """Return only the kwargs whose values were explicitly set on the command line."""
-    explicit: dict[str, object] = {}
-    for param_name, value in kwargs.items():
-        source = ctx.get_parameter_source(param_name)
-        if source is click.core.ParameterSource.COMMANDLINE:
-            key, converted = _expand_cli_param(param_name, value)
-            explicit[key] = converted
-    return explicit
+    commandline = click.core.ParameterSource.COMMANDLINE
+    return dict(
+        _expand_cli_param(name, value)
+        for name, value in kwargs.items()
+        if ctx.get_parameter_source(name) is commandline
+    )
 
 
 @click.command()
@@ -67,7 +81,8 @@ def _collect_explicit_args(ctx: click.Context, **kwargs: object) -> dict[str, ob
 @click.option(
     "--ignore",
     multiple=True,
-    help="Glob patterns to exclude (repeatable).",
+    help="Glob patterns to exclude (repeatable). "
+    "Matching directories are not descended into.",
 )
 @click.option(
     "--languages",
@@ -112,6 +127,9 @@ def main(
     Pass one or more file or directory PATHS to analyze.
     Defaults to the current directory if none are given.
     """
+    from cpitd.config import ConfigFileError, build_config, load_file_config
+    from cpitd.pipeline import scan_and_report
+
     if not paths:
         paths = (".",)
 
@@ -9,7 +9,7 @@ if sys.version_info >= (3, 11):
 else:
     import tomli as tomllib
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from cpitd.tokenizer import NormalizationLevel
 from cpitd.types import frozen_slots
@@ -47,6 +47,9 @@ _TOML_KEY_TO_FIELD: dict[str, str] = {
 _TUPLE_FIELDS = frozenset({"ignore_patterns", "languages", "suppress_patterns"})
 
 
+_VALID_FORMATS = frozenset({"human", "json"})
+
+
 def _require_strict_int(toml_key: str, value: object, hint: str = "") -> int:
     """Raise ConfigFileError unless *value* is an int (not bool)."""
     if isinstance(value, bool) or not isinstance(value, int):
@@ -57,46 +60,66 @@ def _require_strict_int(toml_key: str, value: object, hint: str = "") -> int:
     return value
 
 
+def _validate_min_tokens(toml_key: str, value: object) -> object:
+    return _require_strict_int(toml_key, value)
+
+
+def _validate_normalize(toml_key: str, value: object) -> object:
+    level = _require_strict_int(toml_key, value, hint=" (0-2)")
+    try:
+        return NormalizationLevel(level)
+    except ValueError:
+        raise ConfigFileError(
+            f"[tool.cpitd] '{toml_key}' must be 0, 1, or 2, got {value}"
+        ) from None
+
+
+def _validate_output_format(toml_key: str, value: object) -> object:
+    if not isinstance(value, str):
+        raise ConfigFileError(
+            f"[tool.cpitd] '{toml_key}' must be a string, got {type(value).__name__}"
+        )
+    if value not in _VALID_FORMATS:
+        raise ConfigFileError(
+            f"[tool.cpitd] '{toml_key}' must be 'human' or 'json', got '{value}'"
+        )
+    return value
+
+
+def _validate_bool(toml_key: str, value: object) -> object:
+    if not isinstance(value, bool):
+        raise ConfigFileError(
+            f"[tool.cpitd] '{toml_key}' must be a boolean, got {type(value).__name__}"
+        )
+    return value
+
+
+def _validate_str_list(toml_key: str, value: object) -> object:
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ConfigFileError(f"[tool.cpitd] '{toml_key}' must be a list of strings")
+    return tuple(value)
+
+
+# Config field name -> validator taking (toml_key, raw value) and returning
+# the converted value or raising ConfigFileError.
+_FIELD_VALIDATORS: dict[str, Callable[[str, object], object]] = {
+    "min_tokens": _validate_min_tokens,
+    "normalize": _validate_normalize,
+    "output_format": _validate_output_format,
+    "ignore_patterns": _validate_str_list,
+    "languages": _validate_str_list,
+    "suppress_patterns": _validate_str_list,
+    "verbose": _validate_bool,
+    "show_text": _validate_bool,
+}
+
+
 def _convert_value(toml_key: str, field_name: str, value: object) -> object:
     """Validate and convert a single TOML value to its Config-compatible type."""
-    if field_name == "min_tokens":
-        return _require_strict_int(toml_key, value)
-
-    if field_name == "normalize":
-        _require_strict_int(toml_key, value, hint=" (0-2)")
-        try:
-            return NormalizationLevel(value)
-        except ValueError:
-            raise ConfigFileError(
-                f"[tool.cpitd] '{toml_key}' must be 0, 1, or 2, got {value}"
-            ) from None
-
-    if field_name == "output_format":
-        if not isinstance(value, str):
-            raise ConfigFileError(
-                f"[tool.cpitd] '{toml_key}' must be a string, got {type(value).__name__}"
-            )
-        if value not in {"human", "json"}:
-            raise ConfigFileError(
-                f"[tool.cpitd] '{toml_key}' must be 'human' or 'json', got '{value}'"
-            )
-        return value
-
-    if field_name in ("verbose", "show_text"):
-        if not isinstance(value, bool):
-            raise ConfigFileError(
-                f"[tool.cpitd] '{toml_key}' must be a boolean, got {type(value).__name__}"
-            )
-        return value
-
-    if field_name in _TUPLE_FIELDS:
-        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
-            raise ConfigFileError(
-                f"[tool.cpitd] '{toml_key}' must be a list of strings"
-            )
-        return tuple(value)
-
-    raise ConfigFileError(f"[tool.cpitd] unhandled field '{toml_key}'")
+    validator = _FIELD_VALIDATORS.get(field_name)
+    if validator is None:
+        raise ConfigFileError(f"[tool.cpitd] unhandled field '{toml_key}'")
+    return validator(toml_key, value)
 
 
 def _parse_toml_section(section: dict[str, Any]) -> dict[str, object]:
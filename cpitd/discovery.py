@@ -2,13 +2,68 @@
 
 from __future__ import annotations
 
-import fnmatch
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
 
+from pygments.lexers import get_all_lexers, get_lexer_for_filename
 from pygments.util import ClassNotFound
 
-from cpitd.tokenizer import _get_lexer
-from cpitd.types import Paths
+from cpitd.tokenizer import _lexer_cache_key
+from cpitd.types import Paths, compile_globs, frozen_slots, usable_cpus
+
+# Lexer identity keyed by _lexer_cache_key(): (lowercased lexer name,
+# lowercased aliases), or None when pygments has no lexer for the file.
+# Process-wide, so repeated discover_files() calls share it.  Avoids a
+# pygments filename-pattern scan and a lexer instantiation per file.
+_EXT_LEXER_CACHE: dict[str, tuple[str, frozenset[str]] | None] = {}
+
+
+def _lexer_info(name: str) -> tuple[str, frozenset[str]] | None:
+    """Return the cached (name, aliases) of the lexer for filename *name*, or None."""
+    key = _lexer_cache_key(name)
+    try:
+        return _EXT_LEXER_CACHE[key]
+    except KeyError:
+        pass
+    try:
+        lexer = get_lexer_for_filename(name)
+    except ClassNotFound:
+        info = None
+    else:
+        info = (lexer.name.lower(), frozenset(a.lower() for a in lexer.aliases))
+    _EXT_LEXER_CACHE[key] = info
+    return info
+
+
+@lru_cache(maxsize=8)
+def _language_filename_re(language_set: frozenset[str]) -> re.Pattern[str]:
+    """Regex matching every filename a lexer for *language_set* could claim.
+
+    pygments only resolves a file to a lexer whose filename patterns match
+    it, so a name this regex rejects can never belong to a requested
+    language and needs no lexer lookup at all.
+    """
+    patterns = [
+        pat
+        for name, aliases, filenames, _ in get_all_lexers()
+        if name.lower() in language_set
+        or not language_set.isdisjoint(a.lower() for a in aliases)
+        for pat in filenames
+    ]
+    # "(?!)" never matches: no lexer belongs to the requested languages.
+    return compile_globs(patterns) or re.compile("(?!)")
+
+
+@frozen_slots
+class _FileFilter:
+    """Per-run file selection criteria, compiled once in discover_files."""
+
+    ignore_re: re.Pattern[str] | None
+    language_set: frozenset[str]  # lowercased; empty means any language
+    language_filename_re: re.Pattern[str] | None
 
 
 def discover_files(
@@ -16,59 +71,178 @@ def discover_files(
     *,
     ignore_patterns: tuple[str, ...] = (),
     languages: tuple[str, ...] = (),
+    max_workers: int | None = None,
 ) -> list[Path]:
     """Collect source files from the given paths.
 
     Recursively walks directories, filters by ignore patterns and language
-    restrictions, and returns files that pygments can tokenize.
+    restrictions, and returns files that pygments can tokenize.  Directories
+    matching an ignore pattern are pruned without being descended into.
 
     Args:
         paths: File or directory paths to scan.
         ignore_patterns: Glob patterns for files/dirs to skip.
         languages: If non-empty, only include files matching these language names.
+        max_workers: Threads used to walk wide directory trees.  Defaults to
+            the number of CPUs this process may run on; ``1`` walks
+            serially in the calling thread.
 
     Returns:
         Sorted list of Path objects for files to analyze.
     """
     collected: list[Path] = []
-
-    for raw_path in paths:
+    language_set = frozenset(lang.lower() for lang in languages)
+    criteria = _FileFilter(
+        ignore_re=compile_globs(os.path.normcase(p) for p in ignore_patterns),
+        language_set=language_set,
+        language_filename_re=(
+            _language_filename_re(language_set) if language_set else None
+        ),
+    )
+    workers = max_workers if max_workers is not None else usable_cpus()
+    fanout = _PARALLEL_FANOUT if workers > 1 else None
+    pending: list[str] = []
+
+    for raw_path in dict.fromkeys(paths):
         p = Path(raw_path)
         if p.is_file():
-            if _should_include(p, ignore_patterns, languages):
+            if _should_include(str(p), p.name, criteria):
                 collected.append(p)
         elif p.is_dir():
-            for child in sorted(p.rglob("*")):
-                if child.is_file() and _should_include(
-                    child, ignore_patterns, languages
-                ):
-                    collected.append(child)
+            files, handoff = _walk(str(p), criteria, fanout)
+            collected.extend(files)
+            pending.extend(handoff)
+
+    if pending:
+        collected.extend(_parallel_walk(pending, criteria, workers))
 
+    # Overlapping roots (a directory plus a file inside it) can still
+    # produce duplicates, so dedupe before the single final sort.
     return sorted(set(collected))
 
 
-def _should_include(
-    path: Path,
-    ignore_patterns: tuple[str, ...],
-    languages: tuple[str, ...],
-) -> bool:
-    """Determine if a file should be included in analysis."""
-    path_str = str(path)
+# A directory with more subdirectories than this hands them to the thread
+# pool; narrower ones are walked inline to avoid scheduling overhead.
+_PARALLEL_FANOUT = 4
 
-    for pattern in ignore_patterns:
-        if fnmatch.fnmatch(path_str, pattern) or fnmatch.fnmatch(path.name, pattern):
-            return False
+# Path separators a root may already end with (os.altsep is "/" on Windows).
+_SEPARATORS = tuple(sep for sep in (os.sep, os.altsep) if sep)
+
+
+def _parallel_walk(
+    dirs: list[str],
+    criteria: _FileFilter,
+    workers: int,
+) -> list[Path]:
+    """Walk *dirs* on a thread pool, returning every included file beneath them.
 
+    ``os.scandir`` releases the GIL while waiting on the filesystem, so
+    threads overlap directory reads on cold caches and network mounts.
+    """
+    collected: list[Path] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_walk, d, criteria, _PARALLEL_FANOUT) for d in dirs}
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, handoff = future.result()
+                collected.extend(files)
+                futures.update(
+                    pool.submit(_walk, d, criteria, _PARALLEL_FANOUT) for d in handoff
+                )
+    return collected
+
+
+def _walk(
+    root: str,
+    criteria: _FileFilter,
+    fanout: int | None = None,
+) -> tuple[list[Path], list[str]]:
+    """Collect every included file under *root*.
+
+    Uses ``os.scandir`` so directory/file checks come from cached ``d_type``
+    data rather than extra ``stat()`` calls, and only builds ``Path`` objects
+    for files that pass the filters.  Symlinked directories are not followed,
+    matching ``Path.rglob``.
+
+    Returns:
+        A (files, handoff) pair.  When *fanout* is set, the subdirectories of
+        any directory with more than *fanout* of them are returned unwalked in
+        *handoff* so the caller can schedule them elsewhere.
+    """
+    files: list[Path] = []
+    handoff: list[str] = []
+    stack = [root]
+    while stack:
+        dir_path = stack.pop()
+        if dir_path == ".":
+            prefix = ""
+        elif dir_path.endswith(_SEPARATORS):  # a root such as "/" or "C:/"
+            prefix = dir_path
+        else:
+            prefix = dir_path + os.sep
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subdirs: list[str] = []
+        for entry in entries:
+            path_str = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if not _is_ignored(path_str, entry.name, criteria.ignore_re):
+                    subdirs.append(path_str)
+            elif _is_file(entry) and _should_include(path_str, entry.name, criteria):
+                files.append(Path(path_str))
+        if fanout is not None and len(subdirs) > fanout:
+            handoff.extend(subdirs)
+        else:
+            stack.extend(subdirs)
+    return files, handoff
+
+
+def _is_file(entry: os.DirEntry[str]) -> bool:
+    """Return True if *entry* is a file, following symlinks.
+
+    Like ``Path.is_file``, a symlink loop or a link through a regular file
+    counts as "not a file" instead of raising.
+    """
     try:
-        lexer = _get_lexer(path.name)
-    except ClassNotFound:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+def _is_ignored(path_str: str, name: str, ignore_re: re.Pattern[str] | None) -> bool:
+    """Return True if *path_str* or its base *name* matches the ignore regex.
+
+    Both are case-normalized the way ``fnmatch.fnmatch`` does on this platform.
+    """
+    if ignore_re is None:
+        return False
+    return bool(
+        ignore_re.match(os.path.normcase(path_str))
+        or ignore_re.match(os.path.normcase(name))
+    )
+
+
+def _should_include(path_str: str, name: str, criteria: _FileFilter) -> bool:
+    """Determine if a file should be included in analysis."""
+    if _is_ignored(path_str, name, criteria.ignore_re):
+        return False
+
+    name_re = criteria.language_filename_re
+    if name_re is not None and not name_re.match(name):
+        return False
+
+    info = _lexer_info(name)
+    if info is None:
         return False
 
-    if languages:
-        lexer_name = lexer.name.lower()
-        lexer_aliases = {a.lower() for a in lexer.aliases}
-        language_set = {lang.lower() for lang in languages}
-        if not (language_set & ({lexer_name} | lexer_aliases)):
+    language_set = criteria.language_set
+    if language_set:
+        lexer_name, lexer_aliases = info
+        if lexer_name not in language_set and language_set.isdisjoint(lexer_aliases):
             return False
 
     return True
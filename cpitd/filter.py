@@ -2,26 +2,74 @@
 
 from __future__ import annotations
 
+import os
+from bisect import bisect_right
+from collections import defaultdict
 from collections.abc import Sequence
 from dataclasses import dataclass, field
-from fnmatch import fnmatch
 from typing import Protocol
 
 from cpitd.reporter import CloneCluster
+from cpitd.types import compile_globs
 
 Location = tuple[str, tuple[int, int]]  # (file_path, (start_line, end_line))
 
 
-def _location_overlaps(
-    loc: Location,
-    suppressed: set[Location],
-) -> bool:
-    """Return True if *loc* overlaps any range in *suppressed* for the same file."""
+# Per-file overlap index: file -> (sorted starts, running max of ends).
+_IntervalIndex = dict[str, tuple[list[int], list[int]]]
+
+
+def _build_interval_index(locations: set[Location]) -> _IntervalIndex:
+    """Index *locations* per file for O(log S) overlap probes."""
+    by_file: dict[str, list[tuple[int, int]]] = defaultdict(list)
+    for file_path, span in locations:
+        by_file[file_path].append(span)
+
+    index: _IntervalIndex = {}
+    for file_path, spans in by_file.items():
+        spans.sort()
+        starts = [s for s, _ in spans]
+        max_ends: list[int] = []
+        running = spans[0][1]
+        for _, e in spans:
+            running = max(running, e)
+            max_ends.append(running)
+        index[file_path] = (starts, max_ends)
+    return index
+
+
+def _location_overlaps(loc: Location, index: _IntervalIndex) -> bool:
+    """Return True if *loc* overlaps any indexed range for the same file.
+
+    Intervals starting at or before *loc*'s end are a prefix of the sorted
+    starts; one of them overlaps iff the largest end in that prefix reaches
+    *loc*'s start.
+    """
     file_path, (start, end) = loc
-    for s_file, (s_start, s_end) in suppressed:
-        if s_file == file_path and start <= s_end and s_start <= end:
-            return True
-    return False
+    entry = index.get(file_path)
+    if entry is None:
+        return False
+    starts, max_ends = entry
+    pos = bisect_right(starts, end)
+    return pos > 0 and max_ends[pos - 1] >= start
+
+
+def _substring_literal(pattern: str) -> str | None:
+    """Return *text* for a ``*text*`` glob without wildcards, else None.
+
+    Such a pattern matches a line iff the line contains *text*, so when
+    *text* has no line break, "some line matches" is the same as *text*
+    occurring anywhere in the joined lines.
+    """
+    inner = pattern[1:-1]
+    if (
+        len(pattern) > 2
+        and pattern[0] == pattern[-1] == "*"
+        and not any(c in inner for c in "*?[")
+        and inner.splitlines() == [inner]
+    ):
+        return inner
+    return None
 
 
 # ---------------------------------------------------------------------------
@@ -54,35 +102,48 @@ class PatternMatchStage:
 
     def __init__(self, suppress_patterns: tuple[str, ...]) -> None:
         self._patterns = suppress_patterns
-
-    def _cluster_matches(
-        self,
-        cluster: CloneCluster,
-        ctx: FilterContext,
-    ) -> bool:
-        for loc in cluster.locations:
-            if loc.text is None:
-                continue
-            for line in loc.text.splitlines():
-                for pat in self._patterns:
-                    if fnmatch(line, pat):
-                        return True
-        return False
+        # normcase keeps fnmatch.fnmatch's platform semantics.  "*text*"
+        # patterns become plain substring tests over the whole location
+        # text; the rest share one alternation regex, matched per line.
+        normalized = [os.path.normcase(p) for p in suppress_patterns]
+        literals = [_substring_literal(p) for p in normalized]
+        self._literals = tuple(lit for lit in literals if lit is not None)
+        self._regex = compile_globs(
+            p for p, lit in zip(normalized, literals) if lit is None
+        )
+
+    def _location_matches(self, text: str | None) -> bool:
+        if text is None:
+            return False
+        text = os.path.normcase(text)
+        if any(lit in text for lit in self._literals):
+            return True
+        regex = self._regex
+        if regex is None:
+            return False
+        return any(regex.match(line) for line in text.splitlines())
 
     def __call__(
         self, clusters: list[CloneCluster], ctx: FilterContext
     ) -> list[CloneCluster]:
-        suppressed: set[Location] = set()
+        suppressed = ctx.suppressed_locations
         result: list[CloneCluster] = []
+        # Overlapping clusters often repeat a location, and a location's
+        # text is fixed, so each one is scanned at most once per call.
+        matched: dict[Location, bool] = {}
 
         for cluster in clusters:
-            if self._cluster_matches(cluster, ctx):
-                for loc in cluster.locations:
-                    suppressed.add((loc.file, loc.lines))
+            for loc in cluster.locations:
+                key = (loc.file, loc.lines)
+                hit = matched.get(key)
+                if hit is None:
+                    hit = matched[key] = self._location_matches(loc.text)
+                if hit:
+                    suppressed.update((o.file, o.lines) for o in cluster.locations)
+                    break
             else:
                 result.append(cluster)
 
-        ctx.suppressed_locations.update(suppressed)
         return result
 
 
@@ -92,12 +153,12 @@ class SiblingStage:
     def __call__(
         self, clusters: list[CloneCluster], ctx: FilterContext
     ) -> list[CloneCluster]:
-        locs = ctx.suppressed_locations
+        index = _build_interval_index(ctx.suppressed_locations)
         return [
             c
             for c in clusters
             if not all(
-                _location_overlaps((loc.file, loc.lines), locs) for loc in c.locations
+                _location_overlaps((loc.file, loc.lines), index) for loc in c.locations
             )
         ]
 
@@ -118,18 +179,20 @@ def run_filters(
     return clusters
 
 
+def _suppression_stages(suppress_patterns: tuple[str, ...]) -> list[FilterStage]:
+    """Return the PatternMatchStage + SiblingStage pair for *suppress_patterns*."""
+    if not suppress_patterns:
+        return []
+    return [PatternMatchStage(suppress_patterns), SiblingStage()]
+
+
 def build_filter_stages(config: object) -> list[FilterStage]:
     """Construct the filter stage list from a Config object.
 
     Currently builds PatternMatchStage + SiblingStage when suppress_patterns
     is non-empty.
     """
-    stages: list[FilterStage] = []
-    suppress_patterns = getattr(config, "suppress_patterns", None)
-    if suppress_patterns:
-        stages.append(PatternMatchStage(suppress_patterns))
-        stages.append(SiblingStage())
-    return stages
+    return _suppression_stages(getattr(config, "suppress_patterns", None) or ())
 
 
 def filter_clusters(
@@ -141,10 +204,7 @@ def filter_clusters(
     Convenience wrapper around :func:`run_filters` with
     :class:`PatternMatchStage` and :class:`SiblingStage`.
     """
-    if not suppress_patterns:
+    stages = _suppression_stages(suppress_patterns)
+    if not stages:
         return clusters
-    stages: list[FilterStage] = [
-        PatternMatchStage(suppress_patterns),
-        SiblingStage(),
-    ]
     return run_filters(clusters, stages)
@@ -41,17 +41,22 @@ class LineHashIndex:
     collisions that indicate potential clones.
     """
 
-    _index: dict[int, list[NodeLocation]] = field(
+    # Buckets hold plain (file_path, node) pairs; NodeLocation objects are
+    # only built in find_clones() for the few hashes that actually collide.
+    _index: dict[int, list[tuple[str, HashTreeNode]]] = field(
         default_factory=lambda: defaultdict(list)
     )
 
     def add(self, file_path: str, tree: list[list[HashTreeNode]]) -> None:
         """Add all nodes from a file's hash tree to the index."""
+        index = self._index
         for level in tree:
             for node in level:
-                self._index[node.hash_value].append(
-                    NodeLocation(file_path=file_path, node=node)
-                )
+                bucket = index[node.hash_value]
+                # Buckets past the cap are discarded by find_clones(), so
+                # stop growing them once they are known to be oversized.
+                if len(bucket) <= _MAX_BUCKET_SIZE:
+                    bucket.append((file_path, node))
 
     def find_clones(self, *, min_token_count: int = 10) -> list[CloneMatchGroup]:
         """Find all location groups sharing a hash-tree node hash.
@@ -68,17 +73,32 @@ class LineHashIndex:
         for hash_value, locations in self._index.items():
             if len(locations) < 2 or len(locations) > _MAX_BUCKET_SIZE:
                 continue
-            # Sub-group by level to avoid mixing tree levels
-            by_level: dict[int, list[NodeLocation]] = defaultdict(list)
-            for loc in locations:
-                if loc.node.token_count >= min_token_count:
-                    by_level[loc.node.level].append(loc)
+            valid = [
+                (file_path, node)
+                for file_path, node in locations
+                if node.token_count >= min_token_count
+            ]
+            if len(valid) < 2:
+                continue
+            # Equal hashes almost always come from one tree level, so only
+            # sub-group by level when the bucket actually mixes levels.
+            first_level = valid[0][1].level
+            by_level: dict[int, list[tuple[str, HashTreeNode]]]
+            if all(node.level == first_level for _, node in valid):
+                by_level = {first_level: valid}
+            else:
+                by_level = defaultdict(list)
+                for file_path, node in valid:
+                    by_level[node.level].append((file_path, node))
             for level, level_locs in by_level.items():
                 if len(level_locs) < 2:
                     continue
                 groups.append(
                     CloneMatchGroup(
-                        locations=tuple(level_locs),
+                        locations=tuple(
+                            NodeLocation(file_path=file_path, node=node)
+                            for file_path, node in level_locs
+                        ),
                         level=level,
                         shared_hash=hash_value,
                     )
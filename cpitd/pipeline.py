@@ -5,7 +5,7 @@ from __future__ import annotations
 import enum
 import os
 import sys
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import TextIO
 
@@ -21,9 +21,9 @@ from cpitd.reporter import (
     format_json,
     populate_text,
 )
-from cpitd.tokenizer import NormalizationLevel, tokenize
-from cpitd.types import Paths
-from cpitd.winnowing import build_hash_tree, hash_lines
+from cpitd.tokenizer import NormalizationLevel, tokenize_columns
+from cpitd.types import Paths, usable_cpus
+from cpitd.winnowing import build_hash_tree, hash_line_columns
 
 
 def _warn(msg: str, *, verbose: bool) -> None:
@@ -41,6 +41,10 @@ class _FileResult(enum.Enum):
     SKIP = "skip"
 
 
+# Leading bytes checked for NUL when deciding whether a file is binary.
+_BINARY_SNIFF_BYTES = 8000
+
+
 def _process_file(
     args: tuple[str, str, int, int],
 ) -> tuple:
@@ -50,16 +54,23 @@ def _process_file(
     - (_FileResult.OK, file_key, token_count, tree) on success
     - (_FileResult.READ_ERR, file_key, error_message) on read error
     - (_FileResult.TOK_ERR, file_key, error_message) on tokenizer error
-    - (_FileResult.SKIP,) when below min_tokens threshold
+    - (_FileResult.SKIP,) when below min_tokens threshold or binary
     """
     file_path_str, filename, min_tokens, level_int = args
     try:
-        source = Path(file_path_str).read_text(encoding="utf-8", errors="replace")
+        data = Path(file_path_str).read_bytes()
     except OSError as exc:
         return (_FileResult.READ_ERR, file_path_str, str(exc))
 
+    # Same heuristic as git: a NUL byte near the start means binary data
+    # behind a source-like name; tokenizing it would only produce noise.
+    if b"\0" in data[:_BINARY_SNIFF_BYTES]:
+        return (_FileResult.SKIP,)
+    # pygments normalizes \r\n and \r itself, so no newline translation.
+    source = data.decode("utf-8", errors="replace")
+
     try:
-        tokens = tokenize(
+        tokens = tokenize_columns(
             source, filename=filename, level=NormalizationLevel(level_int)
         )
     except (ValueError, TypeError, LookupError, RuntimeError) as exc:
@@ -68,14 +79,34 @@ def _process_file(
     if len(tokens) < min_tokens:
         return (_FileResult.SKIP,)
 
-    line_hashes = hash_lines(tokens)
+    line_hashes = hash_line_columns(tokens.values, tokens.lines)
     tree = build_hash_tree(line_hashes)
     return (_FileResult.OK, file_path_str, len(tokens), tree)
 
 
+def _process_batch(batch: list[tuple[str, str, int, int]]) -> list[tuple]:
+    """Run :func:`_process_file` over *batch*, in one worker task."""
+    return [_process_file(item) for item in batch]
+
+
+# Target number of batches handed to each worker process.
+_CHUNKS_PER_WORKER = 4
+
+
 def _max_workers() -> int:
-    """Return number of worker processes: CPU count minus 1, minimum 1."""
-    return max(1, (os.cpu_count() or 1) - 1)
+    """Return number of worker processes: usable CPUs minus 1, minimum 1."""
+    return max(1, usable_cpus() - 1)
+
+
+def _file_size(path: str) -> int:
+    """Return the size of *path* in bytes, or 0 if it cannot be stat'ed.
+
+    Unreadable files still go through _process_file, which reports them.
+    """
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
 
 
 def scan(config: Config, paths: Paths) -> tuple[list[CloneCluster], dict[str, int]]:
@@ -105,21 +136,26 @@ def scan(config: Config, paths: Paths) -> tuple[list[CloneCluster], dict[str, in
     # avoiding tail latency when a big file lands in the last batch.
     work_items = sorted(
         ((str(fp), fp.name, config.min_tokens, int(level)) for fp in files),
-        key=lambda item: Path(item[0]).stat().st_size,
+        key=lambda item: _file_size(item[0]),
         reverse=True,
     )
 
-    workers = _max_workers()
-    if workers < 1:
+    workers = min(_max_workers(), len(work_items))
+    if workers <= 1:
+        # A single worker process would only add spawn and pickling cost.
         results: list[tuple] = [_process_file(item) for item in work_items]
     else:
+        # Batch several files per task to amortize IPC.  Batches stripe the
+        # largest-first order (batch i takes items i, i+n, i+2n, ...), so
+        # every batch gets a similar mix of big and small files; contiguous
+        # chunks would put all of the biggest files on one worker.
+        n_batches = min(len(work_items), workers * _CHUNKS_PER_WORKER)
+        batches = [work_items[i::n_batches] for i in range(n_batches)]
         with ProcessPoolExecutor(max_workers=workers) as pool:
-            futures = {pool.submit(_process_file, item): item[0] for item in work_items}
-            results = [f.result() for f in as_completed(futures)]
+            results = [r for batch in pool.map(_process_batch, batches) for r in batch]
 
-    # Sort results by file path for deterministic index insertion order.
-    # as_completed() returns in arrival order which varies between runs;
-    # without this sort, dict iteration in find_clones() is non-deterministic.
+    # Sort results by file path for deterministic index insertion order;
+    # work items were dispatched largest-first, not in path order.
     results.sort(key=lambda r: r[1] if len(r) > 1 and isinstance(r[1], str) else "")
 
     for result in results:
@@ -209,5 +245,10 @@ def _read_file(path: Path, *, verbose: bool = False) -> str | None:
 
 
 def _read_file_str(path: str) -> str | None:
-    """String-path wrapper around _read_file for use with filters."""
+    """String-path wrapper around _read_file for use with populate_text.
+
+    Deliberately uncached: populate_text already reads each file at most
+    once per scan, and a process-wide cache would serve stale text to
+    later scans of edited files.
+    """
     return _read_file(Path(path))
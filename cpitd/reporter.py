@@ -9,6 +9,8 @@ from __future__ import annotations
 import json
 from bisect import bisect_right, insort
 from collections import defaultdict
+from itertools import groupby, islice
+from operator import itemgetter
 from typing import Callable, TextIO
 
 from cpitd.indexer import CloneMatchGroup, NodeLocation
@@ -64,6 +66,27 @@ def _sorted_locs(g: CloneMatchGroup) -> list[NodeLocation]:
     return sorted(g.locations, key=lambda loc: (loc.file_path, loc.node.start_line))
 
 
+# A level-0 group prepared for merging: (shape, start lines, end lines, the
+# start lines a directly following group must have, token count), with the
+# per-location tuples in sorted location order.
+_ShapeEntry = tuple[
+    tuple[str, ...], tuple[int, ...], tuple[int, ...], tuple[int, ...], int
+]
+
+
+def _shape_entry(g: CloneMatchGroup) -> _ShapeEntry:
+    """Reduce a level-0 group to the fields consecutive merging compares."""
+    locs = _sorted_locs(g)
+    ends = tuple(loc.node.end_line for loc in locs)
+    return (
+        tuple(loc.file_path for loc in locs),
+        tuple(loc.node.start_line for loc in locs),
+        ends,
+        tuple(e + 1 for e in ends),
+        g.locations[0].node.token_count,
+    )
+
+
 def _merge_consecutive_groups(groups: list[CloneMatchGroup]) -> list[CloneCluster]:
     """Merge level-0 match groups whose locations all increment by 1.
 
@@ -75,33 +98,34 @@ def _merge_consecutive_groups(groups: list[CloneMatchGroup]) -> list[CloneCluste
     if not groups:
         return []
 
-    by_shape: dict[tuple[str, ...], list[CloneMatchGroup]] = defaultdict(list)
-    for g in groups:
-        shape = tuple(loc.file_path for loc in _sorted_locs(g))
-        by_shape[shape].append(g)
+    # One sort by (shape, first start line) lays every shape bucket out
+    # contiguously and already ordered, so groupby replaces a bucket dict.
+    # Buckets are ranked by first appearance so clusters that later tie on
+    # size keep the order the input produced them in.
+    entries_all = [_shape_entry(g) for g in groups]
+    shape_rank: dict[tuple[str, ...], int] = {}
+    for entry in entries_all:
+        shape_rank.setdefault(entry[0], len(shape_rank))
+    entries_all.sort(key=lambda entry: (shape_rank[entry[0]], entry[1][0]))
 
     clusters: list[CloneCluster] = []
 
-    for shape, shape_groups in by_shape.items():
-        n = len(shape)
-
-        shape_groups.sort(key=lambda g: _sorted_locs(g)[0].node.start_line)
-
-        prev = _sorted_locs(shape_groups[0])
-        run_start: list[int] = [loc.node.start_line for loc in prev]
-        run_end: list[int] = [loc.node.end_line for loc in prev]
-        run_tokens = shape_groups[0].locations[0].node.token_count
-        run_count = 1
+    for shape, bucket in groupby(entries_all, key=itemgetter(0)):
+        entries = list(bucket)
 
-        def _flush() -> None:
+        # A run continues while each group starts right where the previous
+        # one ended, which is a single tuple comparison per group.
+        run_first = 0
+        for j in range(1, len(entries) + 1):
+            if j < len(entries) and entries[j][1] == entries[j - 1][3]:
+                continue
+            run = entries[run_first:j]
+            starts, ends = run[0][1], run[-1][2]
             locs = tuple(
                 sorted(
                     (
-                        CloneLocation(
-                            file=shape[i],
-                            lines=(run_start[i], run_end[i]),
-                        )
-                        for i in range(n)
+                        CloneLocation(file=shape[i], lines=(starts[i], ends[i]))
+                        for i in range(len(shape))
                     ),
                     key=lambda loc: (loc.file, loc.lines),
                 )
@@ -109,26 +133,11 @@ def _merge_consecutive_groups(groups: list[CloneMatchGroup]) -> list[CloneCluste
             clusters.append(
                 CloneCluster(
                     locations=locs,
-                    line_count=run_count,
-                    token_count=run_tokens,
+                    line_count=len(run),
+                    token_count=sum(entry[4] for entry in run),
                 )
             )
-
-        for g in shape_groups[1:]:
-            cur = _sorted_locs(g)
-            if all(cur[i].node.start_line == run_end[i] + 1 for i in range(n)):
-                for i in range(n):
-                    run_end[i] = cur[i].node.end_line
-                run_tokens += g.locations[0].node.token_count
-                run_count += 1
-            else:
-                _flush()
-                run_start = [loc.node.start_line for loc in cur]
-                run_end = [loc.node.end_line for loc in cur]
-                run_tokens = g.locations[0].node.token_count
-                run_count = 1
-
-        _flush()
+            run_first = j
 
     return clusters
 
@@ -171,7 +180,9 @@ def _deduplicate_clusters(clusters: list[CloneCluster]) -> list[CloneCluster]:
 
                 # bisect: only entries with start <= s
                 pos = bisect_right(entries, (s, _INF, _INF))
-                loc_covering = {kidx for start, end, kidx in entries[:pos] if end >= e}
+                loc_covering = {
+                    kidx for _, end, kidx in islice(entries, pos) if end >= e
+                }
                 if not loc_covering:
                     break
                 covering = loc_covering
@@ -251,13 +262,15 @@ def populate_text(
     extraction), the location's text is set to None and a warning is
     emitted via *warn_fn*.
     """
-    cache: dict[str, str | None] = {}
+    # Split lines per file, so files hosting many clones are split once.
+    cache: dict[str, list[str] | None] = {}
     warned: set[str] = set()
 
-    def _read(path: str) -> str | None:
+    def _lines(path: str) -> list[str] | None:
         if path not in cache:
-            cache[path] = read_fn(path)
-            if cache[path] is None and path not in warned:
+            source = read_fn(path)
+            cache[path] = None if source is None else source.splitlines()
+            if source is None and path not in warned:
                 warned.add(path)
                 if warn_fn is not None:
                     warn_fn(
@@ -270,11 +283,10 @@ def populate_text(
     for c in clusters:
         new_locs: list[CloneLocation] = []
         for loc in c.locations:
-            source = _read(loc.file)
-            if source is not None:
+            lines = _lines(loc.file)
+            if lines is not None:
                 start, end = loc.lines
                 context_start = max(1, start - 1)
-                lines = source.splitlines()
                 loc_text = "\n".join(lines[context_start - 1 : end])
             else:
                 loc_text = None
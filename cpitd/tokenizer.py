@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import fnmatch
+import os
+import re
 from enum import IntEnum
 
 import pygments.token as token_types
 from pygments import lex
-from pygments.lexers import get_lexer_for_filename, guess_lexer
+from pygments.lexers import get_all_lexers, get_lexer_for_filename, guess_lexer
 from pygments.util import ClassNotFound
 
 from cpitd.types import frozen_slots
@@ -61,38 +64,91 @@ _LITERAL_TYPES = _expand_token_types(frozenset({token_types.Token.Literal}))
 _ID_PLACEHOLDER = "ID"
 _LIT_PLACEHOLDER = "LIT"
 
+# Token categories, used as indices into the per-level placeholder tuple.
+_KEEP, _SKIP, _IDENTIFIER, _LITERAL = range(4)
+
+# One dict lookup per token classifies it, instead of a membership test
+# against each category set in turn.  Prebuilt for every type that exists
+# at import; types a lexer module creates later are added by _classify().
+_TOKEN_CATEGORY: dict = {
+    **dict.fromkeys(_SKIP_TYPES, _SKIP),
+    **dict.fromkeys(_IDENTIFIER_TYPES, _IDENTIFIER),
+    **dict.fromkeys(_LITERAL_TYPES, _LITERAL),
+}
+
+_CATEGORY_ROOTS = (
+    (token_types.Token.Text, _SKIP),
+    (token_types.Token.Comment, _SKIP),
+    (token_types.Token.Name, _IDENTIFIER),
+    (token_types.Token.Literal, _LITERAL),
+)
+
 
-def _advance_position(
-    line: int, col: int, value: str, newlines: int
-) -> tuple[int, int]:
-    """Update line/column tracking after consuming a token value."""
-    if newlines:
-        return line + newlines, len(value.rsplit("\n", 1)[-1])
-    return line, col + len(value)
+def _classify(ttype) -> int:
+    """Classify a token type missing from _TOKEN_CATEGORY and remember it.
 
+    Lexer modules may define new subtypes on import (e.g. YAML's
+    ``Literal.Scalar.Plain``), after the category sets were expanded.
+    """
+    cat = next((c for root, c in _CATEGORY_ROOTS if ttype in root), _KEEP)
+    _TOKEN_CATEGORY[ttype] = cat
+    return cat
 
-def _normalize_value(ttype, value, level):
-    """Return the normalized token value based on normalization level."""
-    if level >= NormalizationLevel.IDENTIFIERS and ttype in _IDENTIFIER_TYPES:
-        return _ID_PLACEHOLDER
-    if level >= NormalizationLevel.LITERALS and ttype in _LITERAL_TYPES:
-        return _LIT_PLACEHOLDER
-    return value
 
+def _placeholders(level: NormalizationLevel) -> tuple[str | None, ...]:
+    """Return the replacement value per token category at *level* (None keeps it)."""
+    return (
+        None,
+        None,
+        _ID_PLACEHOLDER if level >= NormalizationLevel.IDENTIFIERS else None,
+        _LIT_PLACEHOLDER if level >= NormalizationLevel.LITERALS else None,
+    )
 
-# Lexer cache keyed by file suffix to avoid repeated entry_points iteration.
+
+# Lexer cache keyed by _lexer_cache_key() to avoid repeated entry_points iteration.
 _lexer_cache: dict[str, object | None] = {}
 
 _SENTINEL = object()
 
+# Pygments filename patterns that are not plain ``*.ext`` globs (``Makefile``,
+# ``CMakeLists.txt``, ``*Config.in*``).  Compiled lazily on first lookup.
+_name_patterns: re.Pattern[str] | None = None
+
+
+def _compile_name_patterns() -> re.Pattern[str]:
+    """Compile every name-based pygments filename pattern into one regex."""
+    patterns = {
+        pat
+        for _, _, filenames, _ in get_all_lexers()
+        for pat in filenames
+        if not (pat.startswith("*.") and "*" not in pat[2:])
+    }
+    return re.compile("|".join(fnmatch.translate(p) for p in sorted(patterns)))
+
+
+def _lexer_cache_key(filename: str) -> str:
+    """Return the key under which the lexer lookup for *filename* is cached.
+
+    Plain ``*.ext`` patterns only see the dotted suffix chain of a name
+    (``.css.jinja`` for ``basic.css.jinja``), so files sharing a chain always
+    resolve to the same lexer.  Names matched by a name-based pattern, and
+    names without a dot, are keyed by the whole base name.
+    """
+    global _name_patterns
+    if _name_patterns is None:
+        _name_patterns = _compile_name_patterns()
+    name = os.path.basename(filename)
+    if _name_patterns.match(name):
+        return name
+    dot = name.find(".")
+    return name[dot:] if dot > 0 else name
+
 
 def _get_lexer(filename: str):
     """Get a pygments lexer for a filename, using a suffix-based cache."""
-    # Extract suffix (e.g. ".py") for cache key
-    dot = filename.rfind(".")
-    suffix = filename[dot:] if dot >= 0 else ""
+    key = _lexer_cache_key(filename)
 
-    cached = _lexer_cache.get(suffix, _SENTINEL)
+    cached = _lexer_cache.get(key, _SENTINEL)
     if cached is not _SENTINEL:
         if cached is None:
             raise ClassNotFound(f"no lexer for {filename!r}")
@@ -102,19 +158,42 @@ def _get_lexer(filename: str):
     try:
         lexer = get_lexer_for_filename(filename, stripall=True)
     except ClassNotFound:
-        _lexer_cache[suffix] = None
+        _lexer_cache[key] = None
         raise
-    _lexer_cache[suffix] = lexer
+    _lexer_cache[key] = lexer
     return lexer
 
 
-def tokenize(
+@frozen_slots
+class TokenColumns:
+    """Tokens as parallel lists, avoiding one ``Token`` object per token.
+
+    ``values[i]``, ``lines[i]`` and ``columns[i]`` describe the same token
+    that ``tokenize`` would return at index ``i``.
+    """
+
+    values: list[str]
+    lines: list[int]
+    columns: list[int]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_tokens(self) -> list[Token]:
+        """Materialize the columns as a list of Token objects."""
+        return list(map(Token, self.values, self.lines, self.columns))
+
+
+def tokenize_columns(
     source: str,
     *,
     filename: str | None = None,
     level: NormalizationLevel = NormalizationLevel.EXACT,
-) -> list[Token]:
-    """Tokenize source code and return normalized tokens.
+) -> TokenColumns:
+    """Tokenize source code into parallel value/line/column lists.
+
+    Same tokens as :func:`tokenize`, without allocating a ``Token`` per
+    token; the scan pipeline only needs values and line numbers.
 
     Args:
         source: The source code text to tokenize.
@@ -122,24 +201,57 @@ def tokenize(
         level: How aggressively to normalize tokens.
 
     Returns:
-        List of Token objects with whitespace/comments stripped.
+        A TokenColumns with whitespace/comments stripped.
     """
     if filename:
         lexer = _get_lexer(filename)
     else:
         lexer = guess_lexer(source)
 
-    tokens = []
+    values: list[str] = []
+    lines: list[int] = []
+    columns: list[int] = []
+    add_value, add_line, add_column = values.append, lines.append, columns.append
+    category = _TOKEN_CATEGORY.get
+    placeholders = _placeholders(level)
     line = 1
-    col = 0
+    offset = 0  # character offset of the current token in the lexed stream
+    line_start = 0  # offset of the first character on the current line
 
     for ttype, value in lex(source, lexer):
+        cat = category(ttype)
+        if cat is None:
+            cat = _classify(ttype)
+        if cat != _SKIP:
+            add_value(placeholders[cat] or value)
+            add_line(line)
+            add_column(offset - line_start)
+
+        # Columns fall out of the offset, so only tokens that contain a
+        # newline need a rescan of their text.
         newlines = value.count("\n")
+        if newlines:
+            line += newlines
+            line_start = offset + value.rfind("\n") + 1
+        offset += len(value)
+
+    return TokenColumns(values=values, lines=lines, columns=columns)
 
-        if ttype not in _SKIP_TYPES:
-            normalized = _normalize_value(ttype, value, level)
-            tokens.append(Token(value=normalized, line=line, column=col))
 
-        line, col = _advance_position(line, col, value, newlines)
+def tokenize(
+    source: str,
+    *,
+    filename: str | None = None,
+    level: NormalizationLevel = NormalizationLevel.EXACT,
+) -> list[Token]:
+    """Tokenize source code and return normalized tokens.
+
+    Args:
+        source: The source code text to tokenize.
+        filename: Optional filename hint for language detection.
+        level: How aggressively to normalize tokens.
 
-    return tokens
+    Returns:
+        List of Token objects with whitespace/comments stripped.
+    """
+    return tokenize_columns(source, filename=filename, level=level).to_tokens()
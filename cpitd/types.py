@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import fnmatch
+import os
+import re
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 # Reusable decorator for immutable, slot-based dataclasses.
@@ -9,3 +13,28 @@ frozen_slots = dataclass(frozen=True, slots=True)
 
 # Semantic alias for CLI positional path arguments.
 Paths = tuple[str, ...]
+
+
+def compile_globs(patterns: Iterable[str]) -> re.Pattern[str] | None:
+    """Compile fnmatch-style glob *patterns* into one alternation regex.
+
+    ``regex.match(s)`` is true exactly when ``fnmatch.fnmatchcase(s, p)`` is
+    true for some pattern, but costs a single C-level call per subject.
+    Returns None when there are no patterns.
+    """
+    translated = [fnmatch.translate(p) for p in patterns]
+    if not translated:
+        return None
+    return re.compile("|".join(translated))
+
+
+def usable_cpus() -> int:
+    """Return how many CPUs this process may run on, minimum 1.
+
+    Honors CPU affinity (``sched_getaffinity``, where available), so pinned
+    or containerized runs do not oversubscribe.
+    """
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
@@ -6,8 +6,12 @@ and a line-based hash tree for detecting copy-pasted code regions.
 
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Sequence
+from collections import deque
+from functools import lru_cache
+from hashlib import blake2b
+from itertools import islice, repeat
+from operator import add, le
+from typing import Iterable, Iterator, Sequence
 
 from cpitd.tokenizer import Token
 from cpitd.types import frozen_slots
@@ -28,19 +32,113 @@ class Fingerprint:
     token_index: int
 
 
-def _make_fingerprint(
-    tokens: Sequence[Token], idx: int, hash_value: int
-) -> Fingerprint:
-    """Build a Fingerprint from a token index and its hash."""
-    t = tokens[idx]
-    return Fingerprint(
-        hash_value=hash_value, line=t.line, column=t.column, token_index=idx
-    )
+@frozen_slots
+class FingerprintColumns:
+    """Winnowing selections as parallel lists, one entry per fingerprint.
+
+    Entry ``i`` of each list describes the fingerprint that
+    :func:`fingerprint` would return at index ``i``.
+    """
+
+    hashes: list[int]
+    lines: list[int]
+    columns: list[int]
+    token_indices: list[int]
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def to_fingerprints(self) -> list[Fingerprint]:
+        """Materialize the columns as a list of Fingerprint objects."""
+        return list(
+            map(Fingerprint, self.hashes, self.lines, self.columns, self.token_indices)
+        )
 
 
-def _hash_kgram(tokens: Sequence[Token], start: int, k: int) -> int:
-    """Compute a hash for a k-gram starting at the given index."""
-    return hash(tuple(t.value for t in tokens[start : start + k]))
+_MASK64 = (1 << 64) - 1
+_ROLL_BASE = 1000003  # odd multiplier for the polynomial rolling hash
+
+
+# Entries kept by the digest memo caches below.  Keywords, punctuation and
+# normalized lines repeat heavily, so most lookups hit; the bound keeps
+# long scans of unique identifiers from growing the caches without limit.
+_DIGEST_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=_DIGEST_CACHE_SIZE)
+def _value_id(value: str) -> int:
+    """Return a 64-bit id for a token value, independent of the hash seed."""
+    digest = blake2b(value.encode("utf-8", "surrogatepass"), digest_size=8)
+    return int.from_bytes(digest.digest(), "little")
+
+
+def _rolling_hashes(ids: Iterable[int], k: int) -> Iterator[int]:
+    """Yield the hash of every k-gram of *ids* with a rolling polynomial hash.
+
+    Each k-gram hash is derived from its predecessor in O(1) instead of
+    rehashing k ids: ``h(i+1) = h(i) * B - id[i] * B**k + id[i+k]  (mod 2**64)``.
+    Only the last *k* ids are held, so *ids* may be a stream.
+    """
+    it = iter(ids)
+    gram = deque(islice(it, k))
+    if len(gram) < k:
+        return
+    h = 0
+    for value_id in gram:
+        h = (h * _ROLL_BASE + value_id) & _MASK64
+    yield h
+
+    base_k = pow(_ROLL_BASE, k, 1 << 64)
+    push, popleft = gram.append, gram.popleft
+    for value_id in it:
+        h = (h * _ROLL_BASE - popleft() * base_k + value_id) & _MASK64
+        push(value_id)
+        yield h
+
+
+def _winnow(hashes: Iterable[int], window_size: int) -> Iterator[tuple[int, int]]:
+    """Yield the ``(index, hash)`` of each k-gram winnowing selects, in order.
+
+    Each window of *window_size* consecutive hashes contributes its
+    rightmost minimum, recorded once however many windows share it.  Input
+    shorter than one window yields its rightmost minimum.  Works on plain
+    ints only, so it stays free of Token/Fingerprint objects, and holds just
+    one window, so *hashes* may be a stream.
+    """
+    # Monotonic deque of (hash, index) with strictly increasing hashes.  A
+    # new entry evicts every tail entry with a hash >= its own, so the head
+    # is always the rightmost minimum of the current window.  O(1) amortized
+    # per slide instead of rescanning the whole window.
+    window: deque[tuple[int, int]] = deque()
+    push, pop, popleft = window.append, window.pop, window.popleft
+
+    # The head only changes when the new entry empties the deque or the old
+    # head expires, and an entry never returns to the head once it has left.
+    # Emitting on exactly those events (and once for the first full window)
+    # records each selection once without remembering the previous one.
+    first_full = window_size - 1
+    j = -1
+    for j, h in enumerate(hashes):
+        while window and window[-1][0] >= h:
+            pop()
+        if window:
+            push((h, j))
+            if j > first_full and window[0][1] <= j - window_size:
+                popleft()
+                head_hash, head = window[0]
+                yield head, head_hash
+            elif j == first_full:
+                head_hash, head = window[0]
+                yield head, head_hash
+        else:
+            push((h, j))
+            if j >= first_full:
+                yield j, h
+
+    if 0 <= j < first_full:
+        # Not enough hashes for a full window; take the rightmost minimum.
+        head_hash, head = window[0]
+        yield head, head_hash
 
 
 def fingerprint(
@@ -62,37 +160,93 @@ def fingerprint(
     Returns:
         List of selected Fingerprint objects.
     """
-    n = len(tokens)
-    if n < k:
-        return []
+    return fingerprint_columns(
+        [t.value for t in tokens],
+        [t.line for t in tokens],
+        [t.column for t in tokens],
+        k=k,
+        window_size=window_size,
+    ).to_fingerprints()
+
+
+def fingerprint_columns(
+    values: Sequence[str],
+    lines: Sequence[int],
+    columns: Sequence[int],
+    *,
+    k: int = 5,
+    window_size: int = 4,
+) -> FingerprintColumns:
+    """Like :func:`fingerprint`, over parallel token value/line/column sequences.
 
-    num_kgrams = n - k + 1
-    kgram_hashes = [_hash_kgram(tokens, i, k) for i in range(num_kgrams)]
+    Accepts the lists of a :class:`~cpitd.tokenizer.TokenColumns` directly,
+    and returns the selections as columns rather than Fingerprint objects.
 
-    if num_kgrams < window_size:
-        # Not enough k-grams for a full window; take the minimum
-        min_idx = min(range(num_kgrams), key=lambda i: kgram_hashes[i])
-        return [_make_fingerprint(tokens, min_idx, kgram_hashes[min_idx])]
+    Args:
+        values: Normalized token values.
+        lines: Source line of each token in *values*.
+        columns: Source column of each token in *values*.
+        k: Size of k-grams (number of tokens per gram).
+        window_size: Number of k-gram hashes per winnowing window.
 
-    selected: list[Fingerprint] = []
-    prev_selected_idx = -1
+    Returns:
+        A FingerprintColumns of the selected k-grams.
+    """
+    # Map each distinct value to its id once per call.
+    seen: dict[str, int] = {}
+    ids: list[int] = []
+    for value in values:
+        value_id = seen.get(value)
+        if value_id is None:
+            value_id = seen[value] = _value_id(value)
+        ids.append(value_id)
+
+    selected = list(_winnow(_rolling_hashes(ids, k), window_size))
+    token_indices = [i for i, _ in selected]
+    return FingerprintColumns(
+        hashes=[h for _, h in selected],
+        lines=[lines[i] for i in token_indices],
+        columns=[columns[i] for i in token_indices],
+        token_indices=token_indices,
+    )
 
-    for w_start in range(num_kgrams - window_size + 1):
-        w_end = w_start + window_size
 
-        # Find rightmost minimum in this window
-        min_idx = w_start
-        min_hash = kgram_hashes[w_start]
-        for i in range(w_start + 1, w_end):
-            if kgram_hashes[i] <= min_hash:
-                min_idx = i
-                min_hash = kgram_hashes[i]
+def iter_fingerprints(
+    tokens: Iterable[Token],
+    *,
+    k: int = 5,
+    window_size: int = 4,
+) -> Iterator[Fingerprint]:
+    """Yield the fingerprints of :func:`fingerprint` while consuming *tokens*.
+
+    Only the last *k* tokens and the current winnowing window are held, so
+    memory stays O(k + window_size) however long the stream is, and each
+    fingerprint is yielded as soon as its window has been seen.
+
+    Args:
+        tokens: Normalized tokens, in order; any iterable, including a generator.
+        k: Size of k-grams (number of tokens per gram).
+        window_size: Number of k-gram hashes per winnowing window.
+
+    Yields:
+        The selected Fingerprint objects, in the same order as :func:`fingerprint`.
+    """
+    # (line, column) of the most recent tokens.  A selected k-gram starts
+    # fewer than window_size k-grams before the newest one, which ends at
+    # the newest token, so k + window_size positions always cover it.
+    positions: deque[tuple[int, int]] = deque(maxlen=k + window_size)
+    consumed = 0
 
-        if min_idx != prev_selected_idx:
-            selected.append(_make_fingerprint(tokens, min_idx, min_hash))
-            prev_selected_idx = min_idx
+    def ids() -> Iterator[int]:
+        nonlocal consumed
+        for token in tokens:
+            positions.append((token.line, token.column))
+            consumed += 1
+            yield _value_id(token.value)
 
-    return selected
+    for i, h in _winnow(_rolling_hashes(ids(), k), window_size):
+        line, column = positions[i - consumed + len(positions)]
+        yield Fingerprint(hash_value=h, line=line, column=column, token_index=i)
 
 
 # ---------------------------------------------------------------------------
@@ -120,6 +274,25 @@ class HashTreeNode:
     token_count: int
 
 
+def _line_hash(values: Sequence[str]) -> int:
+    """Hash one line's token values to a signed 64-bit int.
+
+    Unlike ``hash()`` on strings, the result does not depend on the
+    per-process hash seed, so lines hashed in different worker processes
+    (e.g. under the ``spawn`` start method) still compare equal.  Each
+    value is length-prefixed so token boundaries stay unambiguous: the
+    single token ``"a\x00b"`` and the tokens ``"a"``, ``"b"`` differ.
+    """
+    return _line_digest("".join([f"{len(v)}:{v}" for v in values]))
+
+
+@lru_cache(maxsize=_DIGEST_CACHE_SIZE)
+def _line_digest(line_text: str) -> int:
+    """Memoized 8-byte blake2b digest of an encoded line, as a signed int."""
+    digest = blake2b(line_text.encode("utf-8", "surrogatepass"), digest_size=8)
+    return int.from_bytes(digest.digest(), "little", signed=True)
+
+
 def hash_lines(tokens: Sequence[Token]) -> list[LineHash]:
     """Group tokens by source line and produce a hash for each line.
 
@@ -130,18 +303,42 @@ def hash_lines(tokens: Sequence[Token]) -> list[LineHash]:
         One ``LineHash`` per source line that contains at least one token,
         ordered by line number.
     """
-    by_line: dict[int, list[str]] = defaultdict(list)
-    for t in tokens:
-        by_line[t.line].append(t.value)
-
-    return [
-        LineHash(
-            hash_value=hash(tuple(values)),
-            line=line,
-            token_count=len(values),
-        )
-        for line, values in sorted(by_line.items())
-    ]
+    return hash_line_columns([t.value for t in tokens], [t.line for t in tokens])
+
+
+def hash_line_columns(values: Sequence[str], lines: Sequence[int]) -> list[LineHash]:
+    """Like :func:`hash_lines`, over parallel token value and line sequences.
+
+    Args:
+        values: Token values (whitespace/comments already stripped).
+        lines: Source line of each token in *values*.
+
+    Returns:
+        One ``LineHash`` per source line that contains at least one token,
+        ordered by line number.
+    """
+    # Tokenizer output is already in line order, so each line's tokens are
+    # contiguous and one pass suffices; sort (stably) only if they are not.
+    if not all(map(le, lines, islice(lines, 1, None))):
+        order = sorted(range(len(lines)), key=lines.__getitem__)
+        values = [values[i] for i in order]
+        lines = [lines[i] for i in order]
+
+    result: list[LineHash] = []
+    append = result.append
+    cur_line = None
+    cur_values: list[str] = []
+    for value, line in zip(values, lines):
+        if line == cur_line:
+            cur_values.append(value)
+            continue
+        if cur_values:
+            append(LineHash(_line_hash(cur_values), cur_line, len(cur_values)))
+        cur_line = line
+        cur_values = [value]
+    if cur_values:
+        append(LineHash(_line_hash(cur_values), cur_line, len(cur_values)))
+    return result
 
 
 def build_hash_tree(line_hashes: list[LineHash]) -> list[list[HashTreeNode]]:
@@ -161,37 +358,32 @@ def build_hash_tree(line_hashes: list[LineHash]) -> list[list[HashTreeNode]]:
     if not line_hashes:
         return []
 
-    # Level 0: leaves
-    level_0 = [
-        HashTreeNode(
-            hash_value=lh.hash_value,
-            start_line=lh.line,
-            end_line=lh.line,
-            level=0,
-            token_count=lh.token_count,
-        )
-        for lh in line_hashes
+    # Each level is computed as parallel columns, derived from the previous
+    # level's columns by even/odd slicing (pairs 0-1, 2-3, …; an odd
+    # trailing node has no partner and is dropped).  Nodes are then built
+    # positionally through map(), avoiding per-node attribute reads of the
+    # level below and keyword-argument construction.
+    hashes = [lh.hash_value for lh in line_hashes]
+    starts = [lh.line for lh in line_hashes]
+    ends = starts
+    counts = [lh.token_count for lh in line_hashes]
+
+    # Level k pairs up 2^k lines, so it exists only while 2^k <= len.
+    num_levels = min(_MAX_TREE_LEVEL, len(line_hashes).bit_length() - 1) + 1
+
+    levels: list[list[HashTreeNode]] = [
+        list(map(HashTreeNode, hashes, starts, ends, repeat(0), counts))
     ]
-
-    levels: list[list[HashTreeNode]] = [level_0]
-
-    for lvl in range(1, _MAX_TREE_LEVEL + 1):
-        prev = levels[lvl - 1]
-        if len(prev) < 2:
-            break
-
-        current: list[HashTreeNode] = []
-        for i in range(0, len(prev) - 1, 2):
-            left, right = prev[i], prev[i + 1]
-            current.append(
-                HashTreeNode(
-                    hash_value=hash((left.hash_value, right.hash_value)),
-                    start_line=left.start_line,
-                    end_line=right.end_line,
-                    level=lvl,
-                    token_count=left.token_count + right.token_count,
-                )
-            )
-        levels.append(current)
+    for lvl in range(1, num_levels):
+        # hash() of an int tuple is unsalted (ints hash to themselves and
+        # tuple hashing has no seed), so this is stable across processes,
+        # and far cheaper than a 64-bit integer mix in Python.
+        hashes = list(map(hash, zip(hashes[0::2], hashes[1::2])))
+        starts = starts[0::2][: len(hashes)]
+        ends = ends[1::2]
+        counts = list(map(add, counts[0::2], counts[1::2]))
+        levels.append(
+            list(map(HashTreeNode, hashes, starts, ends, repeat(lvl), counts))
+        )
 
     return levels
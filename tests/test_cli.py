@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import json
+import subprocess
+import sys
 from pathlib import Path
 
 from click.testing import CliRunner
@@ -142,3 +144,12 @@ class TestCliOptions:
         result = runner.invoke(main, [FIXTURES, "--min-tokens", "5"])
         assert result.exit_code == 1  # clones found
         assert "|" in result.output
+
+
+class TestStartup:
+    def test_importing_cli_does_not_load_pygments(self):
+        code = "import sys, cpitd.cli; print('pygments' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
@@ -71,6 +71,13 @@ class TestLoadFileConfig:
         with pytest.raises(ConfigFileError, match="unknown key 'bogus'"):
             load_file_config(toml)
 
+    def test_edited_file_is_reparsed(self, tmp_path: Path) -> None:
+        toml = tmp_path / "pyproject.toml"
+        toml.write_text("[tool.cpitd]\nmin-tokens = 100\n")
+        assert load_file_config(toml) == {"min_tokens": 100}
+        toml.write_text("[tool.cpitd]\nmin-tokens = 5\nverbose = true\n")
+        assert load_file_config(toml) == {"min_tokens": 5, "verbose": True}
+
 
 # ---------------------------------------------------------------------------
 # Value validation
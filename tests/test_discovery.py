@@ -1,8 +1,9 @@
 """Tests for the file discovery module."""
 
+import os
 from pathlib import Path
 
-from cpitd.discovery import discover_files
+from cpitd.discovery import _FileFilter, _walk, discover_files
 
 FIXTURES = str(Path(__file__).parent / "fixtures")
 
@@ -27,6 +28,14 @@ class TestDiscoverFiles:
         assert "unique.py" not in names
         assert "clone_a.py" in names
 
+    def test_multiple_ignore_patterns(self):
+        files = discover_files(
+            (FIXTURES,), ignore_patterns=("*unique*", "*/clone_[ab].py")
+        )
+        names = {f.name for f in files}
+        assert names.isdisjoint({"unique.py", "clone_a.py", "clone_b.py"})
+        assert "abc_a.py" in names
+
     def test_language_filter(self):
         files = discover_files((FIXTURES,), languages=("python",))
         assert len(files) >= 1
@@ -39,3 +48,60 @@ class TestDiscoverFiles:
     def test_returns_sorted_unique(self):
         files = discover_files((FIXTURES, FIXTURES))
         assert files == sorted(set(files))
+
+    def test_suffixless_files_resolved_by_name(self, tmp_path):
+        (tmp_path / "Makefile").write_text("all:\n\techo hi\n")
+        (tmp_path / "NOTES").write_text("plain words\n")
+        files = discover_files((str(tmp_path),), languages=("make",))
+        assert [f.name for f in files] == ["Makefile"]
+
+    def test_ignored_directory_is_pruned(self, tmp_path):
+        (tmp_path / "vendor").mkdir()
+        (tmp_path / "vendor" / "lib.py").write_text("x = 1\n")
+        (tmp_path / "main.py").write_text("y = 2\n")
+        files = discover_files((str(tmp_path),), ignore_patterns=("vendor",))
+        assert [f.name for f in files] == ["main.py"]
+
+    def test_relative_root_paths_have_no_dot_prefix(self, tmp_path, monkeypatch):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text("x = 1\n")
+        monkeypatch.chdir(tmp_path)
+        assert discover_files((".",)) == [Path("pkg/mod.py")]
+
+    def test_same_suffix_resolves_per_suffix_chain(self, tmp_path):
+        # basic.css.jinja must not inherit the cached lexer of Makefile.jinja
+        (tmp_path / "Makefile.jinja").write_text("all:\n\techo hi\n")
+        (tmp_path / "basic.css.jinja").write_text("a { color: red; }\n")
+        files = discover_files((str(tmp_path),), languages=("make",))
+        assert [f.name for f in files] == ["Makefile.jinja"]
+
+    def test_parallel_walk_matches_serial(self, tmp_path):
+        # More subdirectories than _PARALLEL_FANOUT so the pool is used.
+        for i in range(8):
+            sub = tmp_path / f"pkg{i}" / "inner"
+            sub.mkdir(parents=True)
+            (sub / f"mod{i}.py").write_text("x = 1\n")
+            (sub.parent / "README").write_text("not code\n")
+        serial = discover_files((str(tmp_path),), max_workers=1)
+        parallel = discover_files((str(tmp_path),), max_workers=4)
+        assert len(serial) == 8
+        assert parallel == serial
+
+    def test_root_with_trailing_separator_not_doubled(self, tmp_path):
+        # Path() collapses inner "//", so check the raw strings _walk hands off;
+        # a root of "/" must not yield "//etc"-style paths.
+        (tmp_path / "pkg").mkdir()
+        criteria = _FileFilter(None, frozenset(), None)
+        _, handoff = _walk(str(tmp_path) + os.sep, criteria, fanout=0)
+        assert handoff == [os.path.join(str(tmp_path), "pkg")]
+
+    def test_broken_symlinks_are_skipped(self, tmp_path):
+        # A self-referential link (ELOOP) and a link through a regular file
+        # (ENOTDIR) must not abort the walk.
+        (tmp_path / "main.py").write_text("x = 1\n")
+        (tmp_path / "plainfile").write_text("not a dir\n")
+        os.symlink("self.py", tmp_path / "self.py")
+        os.symlink(os.path.join("plainfile", "child.py"), tmp_path / "x.py")
+        for workers in (1, 4):
+            files = discover_files((str(tmp_path),), max_workers=workers)
+            assert [f.name for f in files] == ["main.py"]
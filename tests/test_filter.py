@@ -14,10 +14,9 @@ from cpitd.reporter import CloneCluster, CloneLocation
 
 def _loc_text(file: str, lines: tuple[int, int]) -> str | None:
     """Extract text with 1 context line above, matching populate_text() behaviour."""
-    source = FILES.get(file)
-    if source is None:
+    src_lines = _FILE_LINES.get(file)
+    if src_lines is None:
         return None
-    src_lines = source.splitlines()
     start, end = lines
     context_start = max(1, start - 1)
     return "\n".join(src_lines[context_start - 1 : end])
@@ -82,6 +81,11 @@ FILES: dict[str, str] = {
     ),
 }
 
+# FILES split once at import; _loc_text runs for every location built.
+_FILE_LINES: dict[str, list[str]] = {
+    name: source.splitlines() for name, source in FILES.items()
+}
+
 
 class TestFilterClusters:
     def test_empty_patterns_no_filtering(self) -> None:
@@ -130,6 +134,15 @@ class TestFilterClusters:
         )
         assert result == []
 
+    def test_literal_and_wildcard_patterns_mixed(self) -> None:
+        """Substring-only and general glob patterns both still apply."""
+        cluster = _make_cluster(
+            [("a.py", (5, 6)), ("b.py", (5, 6))],
+            line_count=2,
+        )
+        assert filter_clusters([cluster], ("*@override*", "*ret?rn 42")) == []
+        assert filter_clusters([cluster], ("*@override*", "ret?rn 42")) == [cluster]
+
     def test_decorator_above_chunk_suppresses(self) -> None:
         """A suppress pattern matching the line above the chunk suppresses it."""
         cluster = _make_cluster(
@@ -288,6 +301,23 @@ class TestSiblingStageIsolation:
         assert len(result) == 1
         assert result[0] == cluster
 
+    def test_overlap_with_earlier_wide_range(self) -> None:
+        """A wide range starting before narrower ones still counts as overlap."""
+        cluster = _make_cluster(
+            [("impl_a.py", (8, 9)), ("impl_b.py", (4, 4))],
+            line_count=2,
+            token_count=10,
+        )
+        ctx = FilterContext()
+        ctx.suppressed_locations = {
+            ("impl_a.py", (1, 10)),
+            ("impl_a.py", (2, 3)),
+            ("impl_a.py", (5, 6)),
+            ("impl_b.py", (3, 5)),
+        }
+        result = SiblingStage()([cluster], ctx)
+        assert result == []
+
     def test_no_suppression_with_empty_locations(self) -> None:
         cluster = _make_cluster()
         ctx = FilterContext()
@@ -57,11 +57,22 @@ class TestLineHashIndex:
     def test_noise_bucket_filtered(self):
         """Buckets exceeding _MAX_BUCKET_SIZE are skipped."""
         index = LineHashIndex()
+        tree = _single_level_tree([_node(99, 1, 1)])  # nodes are immutable
         for i in range(101):
-            index.add(f"file_{i}.py", _single_level_tree([_node(99, 1, 1)]))
+            index.add(f"file_{i}.py", tree)
         groups = index.find_clones()
         assert groups == []
 
+    def test_bucket_at_cap_kept(self):
+        """A bucket of exactly _MAX_BUCKET_SIZE locations still forms a group."""
+        index = LineHashIndex()
+        tree = _single_level_tree([_node(99, 1, 1)])  # nodes are immutable
+        for i in range(100):
+            index.add(f"file_{i}.py", tree)
+        groups = index.find_clones()
+        assert len(groups) == 1
+        assert len(groups[0].locations) == 100
+
     def test_multiple_shared_hashes(self):
         index = LineHashIndex()
         index.add("a.py", _single_level_tree([_node(10, 1, 1), _node(20, 2, 2)]))
@@ -94,3 +105,12 @@ class TestLineHashIndex:
         levels = {g.level for g in groups}
         assert 0 in levels
         assert 1 in levels
+
+    def test_colliding_hash_across_levels_split_by_level(self):
+        """A hash shared by nodes on different levels yields one group per level."""
+        index = LineHashIndex()
+        index.add("a.py", [[_node(7, 1, 1)], [_node(7, 3, 4, level=1)]])
+        index.add("b.py", [[_node(7, 1, 1)], [_node(7, 3, 4, level=1)]])
+        groups = index.find_clones()
+        assert sorted(g.level for g in groups) == [0, 1]
+        assert all(len(g.locations) == 2 for g in groups)
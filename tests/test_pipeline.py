@@ -6,6 +6,8 @@ import os
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 from cpitd.config import Config
 from cpitd.pipeline import scan, scan_and_report
 from cpitd.tokenizer import NormalizationLevel
@@ -13,6 +15,30 @@ from cpitd.tokenizer import NormalizationLevel
 FIXTURES = str(Path(__file__).parent / "fixtures")
 
 
+# Scans shared by several tests.  Each runs the pipeline once per module;
+# results are shared, so tests must not mutate them.
+
+
+@pytest.fixture(scope="module")
+def base_scan():
+    """Scan of FIXTURES with ``Config(min_tokens=5)`` (exact normalization)."""
+    return scan(Config(min_tokens=5), (FIXTURES,))
+
+
+@pytest.fixture(scope="module")
+def suppressed_scan():
+    """:func:`base_scan` with ``@abstractmethod`` clones suppressed."""
+    config = Config(min_tokens=5, suppress_patterns=("*@abstractmethod*",))
+    return scan(config, (FIXTURES,))
+
+
+@pytest.fixture(scope="module")
+def identifiers_scan():
+    """:func:`base_scan` with identifiers normalized."""
+    config = Config(min_tokens=5, normalize=NormalizationLevel.IDENTIFIERS)
+    return scan(config, (FIXTURES,))
+
+
 def _files_in_clusters(clusters):
     """Extract all unique file basenames from clusters."""
     files = set()
@@ -29,9 +55,8 @@ def _cluster_contains_files(cluster, *names):
 
 
 class TestScan:
-    def test_detects_clones_in_fixtures(self):
-        config = Config(min_tokens=5)
-        clusters, _ = scan(config, (FIXTURES,))
+    def test_detects_clones_in_fixtures(self, base_scan):
+        clusters, _ = base_scan
         clone_found = any(
             _cluster_contains_files(c, "clone_a.py", "clone_b.py") for c in clusters
         )
@@ -40,9 +65,8 @@ class TestScan:
             f"{[{Path(loc.file).name for loc in c.locations} for c in clusters]}"
         )
 
-    def test_clone_cluster_has_locations(self):
-        config = Config(min_tokens=5)
-        clusters, _ = scan(config, (FIXTURES,))
+    def test_clone_cluster_has_locations(self, base_scan):
+        clusters, _ = base_scan
         for c in clusters:
             if _cluster_contains_files(c, "clone_a.py", "clone_b.py"):
                 assert len(c.locations) >= 2
@@ -51,45 +75,32 @@ class TestScan:
                 break
 
     def test_high_min_tokens_filters_small_files(self):
-        config = Config(min_tokens=999999)
-        clusters, _ = scan(config, (FIXTURES,))
+        clusters, _ = scan(Config(min_tokens=999999), (FIXTURES,))
         assert clusters == []
 
-    def test_min_tokens_filters_clone_groups(self):
+    def test_min_tokens_filters_clone_groups(self, base_scan):
         """--min-tokens should filter clone groups, not just whole files."""
-        low = Config(min_tokens=5)
-        high = Config(min_tokens=200)
-        clusters_low, _ = scan(low, (FIXTURES,))
-        clusters_high, _ = scan(high, (FIXTURES,))
+        clusters_low, _ = base_scan
+        clusters_high, _ = scan(Config(min_tokens=200), (FIXTURES,))
         assert len(clusters_low) > len(clusters_high)
 
-    def test_normalization_affects_results(self):
-        config_exact = Config(
-            min_tokens=5,
-            normalize=NormalizationLevel.EXACT,
-        )
-        config_norm = Config(
-            min_tokens=5,
-            normalize=NormalizationLevel.IDENTIFIERS,
-        )
-        clusters_exact, _ = scan(config_exact, (FIXTURES,))
-        clusters_norm, _ = scan(config_norm, (FIXTURES,))
+    def test_normalization_affects_results(self, base_scan, identifiers_scan):
+        clusters_exact, _ = base_scan
+        clusters_norm, _ = identifiers_scan
         # Normalizing identifiers should find at least as many clone locations
         exact_locs = sum(len(c.locations) for c in clusters_exact)
         norm_locs = sum(len(c.locations) for c in clusters_norm)
         assert norm_locs >= exact_locs
 
-    def test_returns_file_token_counts(self):
-        config = Config(min_tokens=5)
-        _, file_token_counts = scan(config, (FIXTURES,))
+    def test_returns_file_token_counts(self, base_scan):
+        _, file_token_counts = base_scan
         assert len(file_token_counts) > 0
         assert all(isinstance(v, int) and v > 0 for v in file_token_counts.values())
 
 
 class TestScanWithSuppression:
-    def test_abc_fixtures_detected_without_suppression(self):
-        config = Config(min_tokens=5)
-        clusters, _ = scan(config, (FIXTURES,))
+    def test_abc_fixtures_detected_without_suppression(self, base_scan):
+        clusters, _ = base_scan
         abc_found = any(
             _cluster_contains_files(c, "abc_a.py", "abc_b.py") for c in clusters
         )
@@ -98,24 +109,16 @@ class TestScanWithSuppression:
             f"got: {[{Path(loc.file).name for loc in c.locations} for c in clusters]}"
         )
 
-    def test_suppress_abstractmethod_clones(self):
-        config = Config(
-            min_tokens=5,
-            suppress_patterns=("*@abstractmethod*",),
-        )
-        clusters, _ = scan(config, (FIXTURES,))
+    def test_suppress_abstractmethod_clones(self, suppressed_scan):
+        clusters, _ = suppressed_scan
         for c in clusters:
             assert not _cluster_contains_files(c, "abc_a.py", "abc_b.py"), (
                 f"abc_a/abc_b should be suppressed, got cluster with: "
                 f"{[Path(loc.file).name for loc in c.locations]}"
             )
 
-    def test_suppress_does_not_affect_real_clones(self):
-        config = Config(
-            min_tokens=5,
-            suppress_patterns=("*@abstractmethod*",),
-        )
-        clusters, _ = scan(config, (FIXTURES,))
+    def test_suppress_does_not_affect_real_clones(self, suppressed_scan):
+        clusters, _ = suppressed_scan
         clone_found = any(
             _cluster_contains_files(c, "clone_a.py", "clone_b.py") for c in clusters
         )
@@ -235,6 +238,26 @@ class TestErrorHandling:
         assert "skipping" in stderr
         assert "bad.py" in stderr
 
+    def test_file_deleted_after_discovery_skipped(self, tmp_path, capsys):
+        """A file that vanishes between discovery and scanning is skipped."""
+        gone = tmp_path / "gone.py"
+        config = Config(min_tokens=5, verbose=True)
+        with patch("cpitd.pipeline.discover_files", return_value=[gone]):
+            clusters, _ = scan(config, (str(tmp_path),))
+
+        assert clusters == []
+        stderr = capsys.readouterr().err
+        assert "skipping" in stderr
+        assert "gone.py" in stderr
+
+    def test_binary_file_with_source_suffix_skipped(self, tmp_path):
+        """Files with NUL bytes are treated as binary and not tokenized."""
+        for name in ("a.py", "b.py"):
+            (tmp_path / name).write_bytes(b"x = 1\0\n" * 50)
+        clusters, token_counts = scan(Config(min_tokens=5), (str(tmp_path),))
+        assert clusters == []
+        assert token_counts == {}
+
     def test_unreadable_file_silent_without_verbose(self, tmp_path, capsys):
         """Without --verbose, unreadable files are silently skipped."""
         bad = tmp_path / "bad.py"
@@ -260,7 +283,9 @@ class TestErrorHandling:
         # Force serial mode (workers=0) so the mock applies in-process.
         with (
             patch("cpitd.pipeline._max_workers", return_value=0),
-            patch("cpitd.pipeline.tokenize", side_effect=RuntimeError("lex boom")),
+            patch(
+                "cpitd.pipeline.tokenize_columns", side_effect=RuntimeError("lex boom")
+            ),
         ):
             clusters, _ = scan(config, (str(tmp_path),))
 
@@ -88,6 +88,15 @@ class TestMergeConsecutiveGroups:
         clusters = aggregate_clone_groups(groups, min_group_tokens=1)
         assert len(clusters) == 2
 
+    def test_size_ties_keep_first_seen_shape_order(self):
+        """Equal-size clusters of different shapes keep their input order."""
+        groups = [
+            _group([_loc("c.py", 1, 5), _loc("d.py", 1, 5)], shared_hash=1),
+            _group([_loc("a.py", 2, 9), _loc("b.py", 2, 9)], shared_hash=2),
+        ]
+        clusters = aggregate_clone_groups(groups, min_group_tokens=1)
+        assert [c.locations[0].file for c in clusters] == ["c.py", "a.py"]
+
     def test_three_files_merged(self):
         """Three files sharing consecutive lines merge into one cluster."""
         groups = [
@@ -479,3 +488,27 @@ class TestPopulateText:
         warnings: list[str] = []
         populate_text([cluster], lambda _: None, warn_fn=warnings.append)
         assert len(warnings) == 1
+
+    def test_each_file_read_once(self):
+        """Files shared by several clusters are read (and split) only once."""
+        clusters = [
+            CloneCluster(
+                locations=(
+                    CloneLocation(file="a.py", lines=(start, start + 1)),
+                    CloneLocation(file="b.py", lines=(start, start + 1)),
+                ),
+                line_count=2,
+                token_count=20,
+            )
+            for start in (1, 3, 5)
+        ]
+        files = {"a.py": "1\n2\n3\n4\n5\n6", "b.py": "1\n2\n3\n4\n5\n6"}
+        reads: list[str] = []
+
+        def read(path: str) -> str | None:
+            reads.append(path)
+            return files.get(path)
+
+        result = populate_text(clusters, read)
+        assert sorted(reads) == ["a.py", "b.py"]
+        assert [c.text for c in result] == ["1\n2", "3\n4", "5\n6"]
@@ -1,6 +1,6 @@
 """Tests for the tokenizer module."""
 
-from cpitd.tokenizer import NormalizationLevel, Token, tokenize
+from cpitd.tokenizer import NormalizationLevel, Token, tokenize, tokenize_columns
 
 
 class TestTokenizeExact:
@@ -76,3 +76,24 @@ class TestTokenizeLiterals:
         tokens = tokenize(source, filename="test.py", level=NormalizationLevel.LITERALS)
         values = [t.value for t in tokens]
         assert "42" not in values
+
+
+class TestLateTokenTypes:
+    """Token subtypes created after import are still categorized."""
+
+    def test_yaml_scalar_normalized_as_literal(self):
+        tokens = tokenize(
+            "key: value\n", filename="conf.yaml", level=NormalizationLevel.LITERALS
+        )
+        assert "value" not in [t.value for t in tokens]
+
+
+class TestTokenizeColumns:
+    """The columnar tokenizer yields the same tokens as tokenize()."""
+
+    def test_matches_tokenize(self):
+        source = "def f(a):\n    return a + 'x'  # note\n\nprint(f(1))\n"
+        for level in NormalizationLevel:
+            cols = tokenize_columns(source, filename="test.py", level=level)
+            assert cols.to_tokens() == tokenize(source, filename="test.py", level=level)
+            assert len(cols) == len(cols.values) == len(cols.lines)
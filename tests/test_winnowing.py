@@ -1,5 +1,9 @@
 """Tests for the winnowing fingerprinting algorithm and line-hash tree."""
 
+import os
+import subprocess
+import sys
+
 from cpitd.tokenizer import Token
 from cpitd.winnowing import (
     Fingerprint,
@@ -7,7 +11,10 @@ from cpitd.winnowing import (
     LineHash,
     build_hash_tree,
     fingerprint,
+    fingerprint_columns,
+    hash_line_columns,
     hash_lines,
+    iter_fingerprints,
 )
 
 
@@ -57,6 +64,24 @@ class TestFingerprint:
         hashes_b = {fp.hash_value for fp in fp_b}
         assert hashes_a != hashes_b
 
+    def test_shared_kgram_hashes_match_across_contexts(self):
+        """A k-gram hashes the same regardless of surrounding tokens."""
+        fp_a = fingerprint(_make_tokens(["q", "r", "a", "b", "c"]), k=3, window_size=1)
+        fp_b = fingerprint(_make_tokens(["a", "b", "c", "z"]), k=3, window_size=1)
+        assert fp_a[-1].hash_value == fp_b[0].hash_value
+
+    def test_columns_match_tokens(self):
+        tokens = _make_tokens_multiline([["a", "b", "c"], ["d", "a", "b"], ["c"]])
+        result = fingerprint_columns(
+            [t.value for t in tokens],
+            [t.line for t in tokens],
+            [t.column for t in tokens],
+            k=3,
+            window_size=2,
+        )
+        assert result.to_fingerprints() == fingerprint(tokens, k=3, window_size=2)
+        assert len(result) == len(result.token_indices)
+
     def test_fingerprints_have_position_info(self):
         tokens = _make_tokens(["a", "b", "c", "d", "e", "f"])
         result = fingerprint(tokens, k=3, window_size=2)
@@ -76,6 +101,19 @@ class TestFingerprint:
         # Should still return at least one fingerprint
         assert len(result) >= 1
 
+    def test_short_input_selects_rightmost_minimum(self):
+        """Fewer k-grams than a window still follows the rightmost-min rule."""
+        result = fingerprint(_make_tokens(["a", "a", "a", "a"]), k=2, window_size=4)
+        assert [fp.token_index for fp in result] == [2]
+        streamed = iter_fingerprints(_make_tokens(["a", "a", "a", "a"]), k=2)
+        assert list(streamed) == result
+
+    def test_iter_fingerprints_matches_fingerprint(self):
+        tokens = _make_tokens_multiline([["a", "b", "a"], ["b", "c", "a"], ["b", "a"]])
+        for k, window_size in [(3, 2), (2, 4), (4, 10), (9, 2)]:
+            streamed = iter_fingerprints(iter(tokens), k=k, window_size=window_size)
+            assert list(streamed) == fingerprint(tokens, k=k, window_size=window_size)
+
 
 class TestHashLines:
     """Tests for per-line token hashing."""
@@ -109,6 +147,11 @@ class TestHashLines:
         result = hash_lines(tokens)
         assert result[0].hash_value == result[1].hash_value
 
+    def test_token_boundaries_affect_hash(self):
+        tokens = _make_tokens_multiline([["a\x00b"], ["a", "b"], ["a1:b"]])
+        result = hash_lines(tokens)
+        assert len({lh.hash_value for lh in result}) == 3
+
     def test_different_lines_different_hash(self):
         tokens = _make_tokens_multiline(
             [
@@ -123,6 +166,33 @@ class TestHashLines:
         result = hash_lines([])
         assert result == []
 
+    def test_hash_independent_of_hash_seed(self):
+        """Line hashes must agree across processes with different hash seeds."""
+        code = (
+            "from cpitd.tokenizer import Token\n"
+            "from cpitd.winnowing import hash_lines\n"
+            "toks = [Token(value=v, line=1, column=i)"
+            " for i, v in enumerate(['x', '=', 'ID'])]\n"
+            "print(hash_lines(toks)[0].hash_value)\n"
+        )
+        outputs = {
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                text=True,
+                check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+            ).stdout
+            for seed in ("1", "2")
+        }
+        assert len(outputs) == 1
+
+    def test_columns_match_tokens(self):
+        tokens = _make_tokens_multiline([["a", "b"], ["c"], ["a", "b"]])
+        values = [t.value for t in tokens]
+        lines = [t.line for t in tokens]
+        assert hash_line_columns(values, lines) == hash_lines(tokens)
+
     def test_token_count_per_line(self):
         tokens = _make_tokens_multiline(
             [